@@ -1,8 +1,13 @@
+import json
 import signal
+import threading
+from typing import Optional
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from rocketry import Rocketry
+from rocketry.conds import cron, daily, every
 from prometheus_client import make_asgi_app
 
 from version_checker_service import VersionCheckerService
@@ -15,6 +20,7 @@ import asyncio
 
 app = FastAPI()
 service = VersionCheckerService()
+warmup_stop = threading.Event()
 scheduler = Rocketry(config={
     'task_execution': 'async',
     'silence_task_logging': False,
@@ -26,13 +32,26 @@ class Server(uvicorn.Server):
     Customized uvicorn.Server
     """
     def handle_exit(self, sig: int, frame) -> None:
+        warmup_stop.set()
         scheduler.session.shut_down()
         return super().handle_exit(sig, frame)
 
 
-@scheduler.task('daily')
+# Условие запуска задается в apply_schedule, когда конфигурация прочитана
+@scheduler.task()
 def run_checks():
-    service.check_versions()
+    service.start_check()
+
+
+def apply_schedule():
+    shedule = service.config.shedule
+    scheduler.session['run_checks'].start_cond = cron(shedule) if shedule else daily
+
+
+@scheduler.task(every('1 minute'))
+def refresh_tiers():
+    # Образы с уровнями обновления проверяются по своему интервалу между полными проверками
+    service.start_refresh()
 
 # Настройка CORS
 app.add_middleware(
@@ -44,25 +63,108 @@ app.add_middleware(
 
 app.mount('/metrics', make_asgi_app(service.metrics.registry))
 
+WARMUP_MAX_DELAY = 60
+
+
+def warmup():
+    # Чтение конфигурации, расписание и первичная загрузка инвентаря;
+    # /ready переключается только после нее.
+    # Повторяем с экспоненциальной задержкой, пока конфигурация и API-сервер не будут доступны
+    delay = 1
+    while not service.ready and not warmup_stop.is_set():
+        try:
+            apply_schedule()
+            service.load_inventory()
+            logger.info(f'Inventory loaded: {len(service.images)} containers')
+        except Exception as e:
+            logger.info(f'Inventory warmup failed, retrying in {delay}s: {e}')
+            warmup_stop.wait(delay)
+            delay = min(delay * 2, WARMUP_MAX_DELAY)
+
+
 @app.on_event("startup")
 def startup_event():
-    # Запуск фоновой проверки версий
-    # app_rocketry.run()
-    pass
+    # Не блокируем запуск сервера загрузкой клиентов и инвентаря
+    threading.Thread(target=warmup, daemon=True).start()
 
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
 
+@app.get("/ready")
+def readiness_check():
+    if not service.ready:
+        raise HTTPException(status_code=503, detail="Inventory not loaded")
+    return {"status": "ready"}
+
+# Сколько блокирующий /run ждет проверку, прежде чем освободить воркер
+RUN_WAIT_TIMEOUT = 300
+
 @app.get('/run')
 def run():
-    service.check_versions()
-    return {"status": "ok"}
+    # Присоединяется к уже идущей проверке вместо запуска новой
+    current = service.start_check()
+    if not current.wait(RUN_WAIT_TIMEOUT):
+        raise HTTPException(
+            status_code=504,
+            detail=f"Run {current.id} is still running, poll /runs/{current.id}",
+        )
+    if current.status != "completed":
+        raise HTTPException(status_code=500, detail=f"Run {current.id} {current.status}: {current.error}")
+    return {"status": "ok", "run_id": current.id}
+
+@app.post('/runs', status_code=202)
+def start_run():
+    return service.start_check().to_dict()
+
+@app.get('/runs/{run_id}')
+def get_run(run_id: str):
+    current = service.runs.get(run_id)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return current.to_dict()
+
+@app.delete('/runs/{run_id}')
+def cancel_run(run_id: str):
+    current = service.runs.cancel(run_id)
+    if current is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return current.to_dict()
+
+@app.get("/results")
+def get_results(
+    namespace: Optional[str] = None,
+    image: Optional[str] = None,
+    registry: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+):
+    filters = dict(namespace=namespace, image=image, registry=registry, status=status)
+    try:
+        if stream:
+            # NDJSON: по одной записи на строку, без сборки всего ответа в памяти
+            items = service.results.iter(cursor, **filters)
+            return StreamingResponse(
+                (json.dumps(result.to_dict()) + "\n" for _, result in items),
+                media_type="application/x-ndjson",
+            )
+        page, next_cursor = service.results.query(limit, cursor, **filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except LookupError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    return {
+        "items": [result.to_dict() for result in page],
+        "next_cursor": next_cursor,
+    }
 
 @app.post("/reload")
 def reload_config():
     if service.reload_config():
+        apply_schedule()
         logger.info('Configuration reloaded')
         return {"status": "config reloaded"}
     raise HTTPException(status_code=500, detail="Config reload failed")
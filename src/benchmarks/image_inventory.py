@@ -0,0 +1,53 @@
+"""
+Память инвентаря на 10k контейнеров: компактный ImageReference против
+прежней pydantic-модели. Запуск из src:
+
+    python -m benchmarks.image_inventory
+"""
+import tracemalloc
+from typing import Optional
+
+from pydantic import BaseModel
+
+from models.image import ImageReference
+
+
+class PydanticImageReference(BaseModel):
+    name: str
+    registry: str
+    pod_name: str
+    namespace: str
+    tag: Optional[str] = None
+    digest: Optional[str] = None
+    match_regex: Optional[str] = None
+    use_metadata: bool = False
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.registry}/{self.name}"
+
+
+def build(cls, count: int = 10_000):
+    # Строки собираются заново, как при разборе ответа API
+    return [
+        cls(
+            name=''.join(['prometheus/', 'node-exporter', str(i % 50)]),
+            registry=''.join(['quay', '.io']),
+            pod_name=''.join(['exporter-', str(i % 200)]),
+            namespace=''.join(['monitoring-', str(i % 10)]),
+            tag=''.join(['v1.', str(i % 20), '.0']),
+        )
+        for i in range(count)
+    ]
+
+
+if __name__ == "__main__":
+    for cls in (PydanticImageReference, ImageReference):
+        tracemalloc.start()
+        images = build(cls)
+        for image in images:
+            image.full_name
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{cls.__name__}: {current / 1024:.0f} KiB per {len(images)} containers")
+        del images
@@ -0,0 +1,32 @@
+"""
+Пропускная способность разбора ссылок на образы: с мемоизацией и без.
+Запуск из src:
+
+    python -m benchmarks.image_reference
+"""
+import time
+
+from reference import parse_reference
+
+
+images = [
+    f"{registry}{repo}{i}{suffix}"
+    for i in range(300)
+    for registry, repo, suffix in [
+        ("", "nginx", ":1.25.3"),
+        ("quay.io/", "prometheus/node-exporter", ":v1.9.0"),
+        ("registry:5000/", "team/app", "@sha256:" + "a" * 64),
+    ]
+]
+# Типичный кластер: несколько сотен уникальных строк на десятки тысяч контейнеров
+containers = [images[i % len(images)] for i in range(100_000)]
+
+
+if __name__ == "__main__":
+    for label, parse in (("uncached", parse_reference.__wrapped__), ("memoized", parse_reference)):
+        parse_reference.cache_clear()
+        started = time.perf_counter()
+        for image in containers:
+            parse(image)
+        elapsed = time.perf_counter() - started
+        print(f"{label}: {len(containers) / elapsed:,.0f} references/s")
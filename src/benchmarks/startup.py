@@ -0,0 +1,31 @@
+"""
+Замер холодного старта: время импорта app (создание сервиса, Rocketry,
+маршрутов FastAPI) в отдельном процессе. Конфигурация, kubeconfig и
+registry при импорте не читаются, поэтому окружение не подготавливается.
+Запуск из src:
+
+    python -m benchmarks.startup
+"""
+import statistics
+import subprocess
+import sys
+import time
+
+
+# Целевое время холодного старта, в секундах
+STARTUP_TARGET = 2.0
+RUNS = 5
+
+
+def measure() -> float:
+    started = time.perf_counter()
+    subprocess.run([sys.executable, '-c', 'import app'], check=True)
+    return time.perf_counter() - started
+
+
+if __name__ == "__main__":
+    timings = [measure() for _ in range(RUNS)]
+    median = statistics.median(timings)
+    print(f"cold start: median {median:.2f}s, max {max(timings):.2f}s (target {STARTUP_TARGET:.1f}s)")
+    if median > STARTUP_TARGET:
+        sys.exit(f"cold start exceeds target {STARTUP_TARGET:.1f}s")
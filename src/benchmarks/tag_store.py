@@ -0,0 +1,50 @@
+"""
+Память и скорость поиска последней версии: PackedTagStore против обычного
+списка строк на наборе тегов в духе Jenkins. Запуск из src:
+
+    python -m benchmarks.tag_store
+"""
+import time
+import tracemalloc
+from typing import Optional
+
+from tag_store import PackedTagStore
+from version import VersionNormalizer, version_key
+
+
+def build_tags() -> list[str]:
+    # Набор в духе Jenkins: lts/jdk варианты и тысячи weekly релизов
+    return [
+        ''.join([str(major), '.', str(minor), '.', str(patch), suffix])
+        for major in range(2)
+        for minor in range(500)
+        for patch in range(3)
+        for suffix in ('', '-jdk17', '-lts', '-lts-jdk17', '-alpine', '-slim', '-rhel', '-jdk21', '-lts-jdk21', '-lts-alpine')
+    ] + [f'v{i}.0.0' for i in range(2000)]
+
+
+def latest_from_list(tags: list[str], prefix: str) -> Optional[str]:
+    matching = []
+    for v in tags:
+        v_prefix, v_num = VersionNormalizer.normalize(v)
+        if v_prefix == prefix:
+            matching.append((v_num, v))
+    matching.sort(reverse=True, key=lambda x: version_key(x[0]))
+    return matching[0][1] if matching else None
+
+
+if __name__ == "__main__":
+    for label, build in (("list[str]", build_tags), ("PackedTagStore", lambda: PackedTagStore(build_tags()))):
+        tracemalloc.start()
+        tags = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label}: {current / 1024:.0f} KiB for {len(tags)} tags")
+
+    tags = build_tags()
+    store = PackedTagStore(tags)
+    for label, find in (("list[str]", lambda p: latest_from_list(tags, p)), ("PackedTagStore", store.latest)):
+        started = time.perf_counter()
+        for _ in range(20):
+            result = find('v')
+        print(f"{label}: latest {result} in {(time.perf_counter() - started) / 20 * 1000:.1f} ms")
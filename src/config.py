@@ -1,7 +1,7 @@
 import yaml
 import os
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
 
@@ -18,6 +18,9 @@ class ImageConfig:
     name: str
     desired_tag: str
     pined_major: Optional[int] = None
+    match_regex: Optional[str] = None
+    refresh_tier: Optional[str] = None
+    use_metadata: bool = False
     resolve_sha256: Optional[list[SHA256Resolution]] = None
 
 @dataclass
@@ -27,6 +30,21 @@ class RegistryConfig:
     username: Optional[str] = None
     password: Optional[str] = None
     token: Optional[str] = None
+    # Число параллельных запросов за метаданными образов
+    metadata_workers: int = 8
+    # Хранить списки тегов в упакованном виде (для репозиториев с тысячами тегов)
+    compact_tags: bool = False
+
+@dataclass
+class RefreshConfig:
+    # Интервалы обновления по уровням, в секундах
+    tiers: dict[str, int] = field(default_factory=dict)
+    default_tier: Optional[str] = None
+    # Окно разброса запросов по registry, в секундах
+    jitter: dict[str, int] = field(default_factory=dict)
+    default_jitter: int = 0
+
+DEFAULT_RUN_TIMEOUT = 3600
 
 @dataclass
 class AppConfig:
@@ -34,6 +52,46 @@ class AppConfig:
     images: list[ImageConfig]
     registry: RegistryConfig
     shedule: str
+    refresh: RefreshConfig = field(default_factory=RefreshConfig)
+    # Предельная длительность одной проверки, в секундах
+    run_timeout: int = DEFAULT_RUN_TIMEOUT
+
+DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+def parse_duration(value) -> int:
+    """Переводит 900, "15m", "24h" или "1d" в секунды"""
+    if isinstance(value, int):
+        return value
+    value = str(value).strip()
+    if value[-1:] in DURATION_UNITS:
+        return int(value[:-1]) * DURATION_UNITS[value[-1]]
+    return int(value)
+
+CRON_FIELDS = [
+    ('minute', 0, 59, []),
+    ('hour', 0, 23, []),
+    ('day of month', 1, 31, []),
+    ('month', 1, 12, ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']),
+    ('day of week', 0, 7, ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat']),
+]
+
+def validate_cron(expression: str):
+    """Проверяет cron-выражение из пяти полей: *, числа, диапазоны, списки и шаги"""
+    fields = expression.split()
+    if len(fields) != len(CRON_FIELDS):
+        raise ValueError(f"Invalid shedule {expression!r}: expected 5 fields")
+    for value, (name, low, high, names) in zip(fields, CRON_FIELDS):
+        for item in value.split(','):
+            base, _, step = item.partition('/')
+            if step and not (step.isdigit() and int(step) > 0):
+                raise ValueError(f"Invalid shedule {expression!r}: bad step in {name}")
+            if base == '*':
+                continue
+            for bound in base.split('-', 1):
+                if bound.lower() in names:
+                    continue
+                if not bound.isdigit() or not low <= int(bound) <= high:
+                    raise ValueError(f"Invalid shedule {expression!r}: bad {name} value {bound!r}")
 
 def load_config(config_path: str = "config.yaml") -> AppConfig:
     with open(config_path, 'r') as f:
@@ -68,13 +126,30 @@ def load_config(config_path: str = "config.yaml") -> AppConfig:
                 name=img['name'],
                 desired_tag=img['desired_tag'],
                 pined_major=img.get('pined_major'),
+                match_regex=img.get('match_regex'),
+                refresh_tier=img.get('refresh_tier'),
+                use_metadata=img.get('use_metadata', False),
                 resolve_sha256=sha256_resolutions
             )
         )
     
+    refresh_data = config_data.get('refresh', {})
+    refresh_config = RefreshConfig(
+        tiers={name: parse_duration(v) for name, v in refresh_data.get('tiers', {}).items()},
+        default_tier=refresh_data.get('default_tier'),
+        jitter={name: parse_duration(v) for name, v in refresh_data.get('jitter', {}).items()},
+        default_jitter=parse_duration(refresh_data.get('default_jitter', 0)),
+    )
+
+    shedule = config_data.get('shedule', '')
+    if shedule:
+        validate_cron(shedule)
+
     return AppConfig(
         namespace_list=config_data.get('namespace_list', []),
         images=images_config,
         registry=RegistryConfig(**registry_config),
-        shedule=config_data.get('shedule', '')
+        shedule=shedule,
+        refresh=refresh_config,
+        run_timeout=parse_duration(config_data.get('run_timeout', DEFAULT_RUN_TIMEOUT))
     )
\ No newline at end of file
@@ -0,0 +1,130 @@
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Callable, Optional
+from config import logger
+from reference import registry_host
+
+
+# Как часто проверять отмену проверки, пока ждем ответы registry, в секундах
+CHECK_INTERVAL = 1
+
+MANIFEST_LIST_TYPES = {
+    "application/vnd.oci.image.index.v1+json",
+    "application/vnd.docker.distribution.manifest.list.v2+json",
+}
+MANIFEST_ACCEPT = ", ".join([
+    *MANIFEST_LIST_TYPES,
+    "application/vnd.oci.image.manifest.v1+json",
+    "application/vnd.docker.distribution.manifest.v2+json",
+])
+
+
+def parse_created(value: Optional[str]) -> Optional[datetime]:
+    """Разбирает поле created из config blob, дробная часть секунд отбрасывается"""
+    if not value:
+        return None
+    match = re.match(r'^(\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d)', value)
+    if not match:
+        return None
+    return datetime.strptime(match.group(1), "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+
+
+class ImageMetadataFetcher:
+    """
+    Получает время создания образов по манифестам и config blob.
+    Содержимое по digest неизменно, поэтому результаты кешируются навсегда:
+    после первого прогона на тег остается только HEAD запрос манифеста.
+    """
+    def __init__(self, session, max_workers: int = 8, timeout: int = 30):
+        self.session = session
+        self.timeout = timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.set_max_workers(max_workers)
+        # digest манифеста -> время создания
+        self._created_by_digest: dict[str, datetime] = {}
+        # digest config blob -> время создания
+        self._created_by_config: dict[str, datetime] = {}
+
+    def set_max_workers(self, max_workers: int):
+        # Пул общий для всех запросов; пересоздается только при смене размера
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='image-metadata')
+
+    def get_created_times(
+        self,
+        image_name: str,
+        registry: str,
+        tags: list[str],
+        check: Optional[Callable[[], None]] = None,
+    ) -> dict[str, datetime]:
+        """
+        check вызывается перед запросами каждого тега и во время ожидания;
+        исключение из него (отмена, дедлайн) снимает еще не начатые запросы
+        и пробрасывается вызывающему.
+        """
+        if not tags:
+            return {}
+
+        def fetch(tag: str) -> Optional[datetime]:
+            if check:
+                check()
+            return self.get_created(image_name, registry, tag)
+
+        futures = {self._pool.submit(fetch, tag): tag for tag in tags}
+        pending = set(futures)
+        created = {}
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=CHECK_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    value = future.result()
+                    if value is not None:
+                        created[futures[future]] = value
+                if check:
+                    check()
+        except BaseException:
+            for future in pending:
+                future.cancel()
+            raise
+        return created
+
+    def get_created(self, image_name: str, registry: str, reference: str) -> Optional[datetime]:
+        base_url = f'https://{registry_host(registry)}/v2/{image_name}'
+        headers = {"Accept": MANIFEST_ACCEPT}
+        try:
+            r = self.session.head(f'{base_url}/manifests/{reference}', headers=headers, timeout=self.timeout)
+            digest = r.headers.get('Docker-Content-Digest')
+            if digest in self._created_by_digest:
+                return self._created_by_digest[digest]
+
+            r = self.session.get(f'{base_url}/manifests/{digest or reference}', headers=headers, timeout=self.timeout)
+            r.raise_for_status()
+            manifest = r.json()
+            digest = digest or r.headers.get('Docker-Content-Digest')
+
+            if manifest.get('mediaType') in MANIFEST_LIST_TYPES or 'manifests' in manifest:
+                # Для multi-arch образов берем первый манифест из списка
+                child = manifest['manifests'][0]['digest']
+                created = self.get_created(image_name, registry, child)
+            else:
+                created = self._get_config_created(base_url, manifest['config']['digest'])
+        except Exception as e:
+            logger.info(f"Failed to get metadata for {registry}/{image_name}:{reference}: {e}")
+            return None
+
+        if digest and created is not None:
+            self._created_by_digest[digest] = created
+        return created
+
+    def _get_config_created(self, base_url: str, config_digest: str) -> Optional[datetime]:
+        if config_digest in self._created_by_config:
+            return self._created_by_config[config_digest]
+        r = self.session.get(f'{base_url}/blobs/{config_digest}', timeout=self.timeout)
+        r.raise_for_status()
+        created = parse_created(r.json().get('created'))
+        if created is not None:
+            self._created_by_config[config_digest] = created
+        return created
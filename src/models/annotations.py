@@ -1,7 +1,7 @@
 import enum
 
 
-class Annotations(enum, str):
+class Annotations(str, enum.Enum):
 	EnableAnnotationKey = "enable.version-checker.io"
 	OverrideURLAnnotationKey = "override-url.version-checker.io"
 	UseSHAAnnotationKey = "use-sha.version-checker.io"
@@ -1,15 +1,64 @@
-from pydantic import BaseModel
+import sys
 from typing import Optional
 
 
-class ImageReference(BaseModel):
-    name: str
-    registry: str
-    pod_name: str
-    namespace: str
-    tag: Optional[str] = None
-    digest: Optional[str] = None
-    
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value is not None else None
+
+
+class ImageReference:
+    """
+    Компактное описание контейнера из инвентаря.
+    Повторяющиеся строки (registry, name, tag, namespace) интернируются,
+    full_name вычисляется один раз; name и registry после создания не меняются.
+    """
+    __slots__ = (
+        '_name', '_registry', '_full_name',
+        'pod_name', 'namespace', 'tag', 'digest', 'match_regex', 'use_metadata',
+    )
+
+    def __init__(
+        self,
+        name: str,
+        registry: str,
+        pod_name: str,
+        namespace: str,
+        tag: Optional[str] = None,
+        digest: Optional[str] = None,
+        match_regex: Optional[str] = None,
+        use_metadata: bool = False,
+    ):
+        self._name = sys.intern(name)
+        self._registry = sys.intern(registry)
+        self._full_name = sys.intern(f"{registry}/{name}")
+        self.pod_name = sys.intern(pod_name)
+        self.namespace = sys.intern(namespace)
+        self.tag = _intern(tag)
+        self.digest = digest
+        self.match_regex = match_regex
+        self.use_metadata = use_metadata
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def registry(self) -> str:
+        return self._registry
+
     @property
     def full_name(self) -> str:
-        return f"{self.registry}/{self.name}" 
+        return self._full_name
+
+    def __repr__(self) -> str:
+        return (
+            f"ImageReference(name={self.name!r}, registry={self.registry!r}, "
+            f"pod_name={self.pod_name!r}, namespace={self.namespace!r}, "
+            f"tag={self.tag!r}, digest={self.digest!r})"
+        )
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, ImageReference):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
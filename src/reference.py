@@ -0,0 +1,77 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+
+DEFAULT_DOMAIN = "docker.io"
+LEGACY_DEFAULT_DOMAIN = "index.docker.io"
+OFFICIAL_REPO_PREFIX = "library/"
+# Docker Hub отдает API не на docker.io, а на отдельном хосте
+REGISTRY_HOSTS = {DEFAULT_DOMAIN: "registry-1.docker.io"}
+
+# Грамматика из github.com/distribution/reference
+_DOMAIN_COMPONENT = r'(?:[a-zA-Z0-9]|[a-zA-Z0-9][a-zA-Z0-9-]*[a-zA-Z0-9])'
+_DOMAIN = rf'(?:{_DOMAIN_COMPONENT}(?:\.{_DOMAIN_COMPONENT})*|\[[a-fA-F0-9:]+\])(?::[0-9]+)?'
+_PATH_COMPONENT = r'[a-z0-9]+(?:(?:[._]|__|[-]+)[a-z0-9]+)*'
+_TAG = r'[A-Za-z0-9_][A-Za-z0-9_.-]{0,127}'
+_DIGEST = r'[A-Za-z][A-Za-z0-9]*(?:[-_+.][A-Za-z][A-Za-z0-9]*)*:[0-9a-fA-F]{32,}'
+
+REFERENCE_REGEX = re.compile(
+    rf'^(?P<name>(?:{_DOMAIN}/)?{_PATH_COMPONENT}(?:/{_PATH_COMPONENT})*)'
+    rf'(?::(?P<tag>{_TAG}))?'
+    rf'(?:@(?P<digest>{_DIGEST}))?\Z'
+)
+
+
+class ParsedReference(NamedTuple):
+    registry: str
+    name: str
+    tag: Optional[str]
+    digest: Optional[str]
+
+    @property
+    def full_name(self) -> str:
+        return f"{self.registry}/{self.name}"
+
+
+@lru_cache(maxsize=4096)
+def parse_reference(image: str) -> ParsedReference:
+    """
+    Разбирает ссылку на образ по грамматике distribution/reference.
+    Примеры:
+        "nginx" -> ("docker.io", "library/nginx", None, None)
+        "registry:5000/repo:tag" -> ("registry:5000", "repo", "tag", None)
+        "quay.io/org/app@sha256:..." -> ("quay.io", "org/app", None, "sha256:...")
+    Одни и те же строки повторяются в тысячах подов, поэтому результат кешируется.
+    """
+    match = REFERENCE_REGEX.match(image)
+    if not match:
+        raise ValueError(f"Invalid image reference: {image}")
+
+    name = match.group('name')
+    registry = DEFAULT_DOMAIN
+    first, sep, rest = name.partition('/')
+    # Первый компонент считается registry, только если похож на хост
+    if sep and ('.' in first or ':' in first or first == 'localhost' or first != first.lower()):
+        registry, name = first, rest
+    if registry == LEGACY_DEFAULT_DOMAIN:
+        registry = DEFAULT_DOMAIN
+    if registry == DEFAULT_DOMAIN and '/' not in name:
+        name = OFFICIAL_REPO_PREFIX + name
+    if len(name) > 255:
+        raise ValueError(f"Repository name too long: {image}")
+
+    return ParsedReference(registry, name, match.group('tag'), match.group('digest'))
+
+
+def canonical_name(image_name: str) -> str:
+    """Приводит имя образа из конфигурации к виду registry/name"""
+    try:
+        return parse_reference(image_name).full_name
+    except ValueError:
+        return image_name
+
+
+def registry_host(registry: str) -> str:
+    return REGISTRY_HOSTS.get(registry, registry)
+
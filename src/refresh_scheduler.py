@@ -0,0 +1,65 @@
+import time
+import zlib
+from typing import Optional
+from config import ImageConfig, RefreshConfig
+from models.image import ImageReference
+from reference import canonical_name
+
+
+class RefreshScheduler:
+    """
+    Определяет, какие образы пора обновить.
+    Каждый образ обновляется с интервалом своего уровня (refresh tier), а
+    стабильный сдвиг внутри окна jitter его registry разносит запросы
+    равномерно по времени вместо одного пика. Полная проверка по shedule
+    теги таких образов не перезапрашивает.
+    """
+    def __init__(self, refresh_config: RefreshConfig, images: list[ImageConfig]):
+        self._next_due: dict[str, float] = {}
+        self.update_config(refresh_config, images)
+
+    def update_config(self, refresh_config: RefreshConfig, images: list[ImageConfig]):
+        self.config = refresh_config
+        self.image_tiers = {canonical_name(img.name): img.refresh_tier for img in images}
+        self._next_due.clear()
+
+    def interval(self, image: ImageReference) -> Optional[int]:
+        tier = self.image_tiers.get(image.full_name) or self.config.default_tier
+        return self.config.tiers.get(tier)
+
+    def offset(self, image: ImageReference, interval: int) -> int:
+        window = min(self.config.jitter.get(image.registry, self.config.default_jitter), interval)
+        if window <= 0:
+            return 0
+        return zlib.crc32(image.full_name.encode()) % window
+
+    def next_slot(self, image: ImageReference, interval: int, now: float) -> float:
+        """Ближайший момент после now в фазе образа: offset + k * interval"""
+        offset = self.offset(image, interval)
+        return ((now - offset) // interval + 1) * interval + offset
+
+    def due(self, images: list[ImageReference], now: Optional[float] = None) -> list[ImageReference]:
+        """Возвращает контейнеры, чьи образы пора проверить"""
+        now = time.time() if now is None else now
+        due_names = set()
+        for image in images:
+            name = image.full_name
+            if name in due_names:
+                continue
+            interval = self.interval(image)
+            if interval is None:
+                continue
+            next_due = self._next_due.get(name)
+            if next_due is None:
+                # Впервые увиденный образ ждет своего слота, чтобы не было всплеска на старте
+                next_due = self._next_due[name] = self.next_slot(image, interval, now)
+            if next_due <= now:
+                due_names.add(name)
+        return [image for image in images if image.full_name in due_names]
+
+    def mark_checked(self, images: list[ImageReference], now: Optional[float] = None):
+        now = time.time() if now is None else now
+        for image in images:
+            interval = self.interval(image)
+            if interval is not None:
+                self._next_due[image.full_name] = self.next_slot(image, interval, now)
@@ -1,37 +1,34 @@
-import requests
 from config import RegistryConfig, logger
 from models.image import ImageReference 
-from version import version_difference
-from typing import Optional, Dict
-from functools import lru_cache
-import re
-
-
-class VersionNormalizer:
-    @staticmethod
-    def normalize(version: str) -> tuple[str, str]:
-        """
-        Нормализует версию и возвращает (префикс, чистая версия)
-        Примеры:
-            "v1.2.3" -> ("v", "1.2.3")
-            "2.5.0" -> ("", "2.5.0")
-            "release-3.1" -> ("release-", "3.1")
-        """
-        match = re.match(r'^([^\d]*)([\d.]+.*)$', version)
-        if match:
-            return (match.group(1), match.group(2))
-        return ("", version)
-
-    @staticmethod
-    def denormalize(prefix: str, version: str) -> str:
-        return f"{prefix}{version}"
+from version import VersionNormalizer, version_difference, version_key
+from urllib.parse import urljoin
+from typing import Callable, Iterable, Optional, Dict, Sequence
+from image_metadata import ImageMetadataFetcher
+from reference import registry_host
+from tag_filter import TagFilter
+from tag_store import PackedTagStore
+
+
+REQUEST_TIMEOUT = 30
+# Предел страниц списка тегов: 200 страниц по 500 тегов
+MAX_TAG_PAGES = 200
 
 
 class RegistryClient:
     def __init__(self, registry_config: RegistryConfig, verify: bool = True):
+        import requests
         self.config = registry_config
         self.session = requests.Session()
         self.session.verify = verify
+        self.tag_filter = TagFilter()
+        self._tags: dict[tuple[str, str], Sequence[str]] = {}
+        # (image_name, registry, regex) -> (список тегов, последний тег по метаданным)
+        self._metadata_latest: dict[tuple[str, str, Optional[str]], tuple[Sequence[str], Optional[str]]] = {}
+        self.metadata = ImageMetadataFetcher(
+            self.session,
+            max_workers=self.config.metadata_workers,
+            timeout=REQUEST_TIMEOUT,
+        )
         
         if self.config.auth_type == "token":
             self.session.headers.update({
@@ -54,24 +51,74 @@ class RegistryClient:
             "major_diff": major_diff
         }
 
-    @lru_cache(maxsize=100)
-    def get_available_versions(self, image_name: str, registry: str, n: int = 500) -> list[str]:
+    def get_available_versions(self, image_name: str, registry: str, n: int = 500) -> Sequence[str]:
+        key = (image_name, registry)
+        if key not in self._tags:
+            tags = self._fetch_tags(image_name, registry, n)
+            # Для больших списков тегов - компактное хранилище с разобранными версиями
+            self._tags[key] = PackedTagStore(tags) if self.config.compact_tags else tags
+        return self._tags[key]
+
+    def _fetch_tags(self, image_name: str, registry: str, n: int) -> list[str]:
+        """Загружает все теги, переходя по страницам из заголовка Link (rel=next)"""
+        tags: list[str] = []
         try:
-            url = f'https://{registry}/v2/{image_name}/tags/list'
-            r = self.session.get(url=url, params={'n': n})
-            return r.json().get('tags', [])
+            url = f'https://{registry_host(registry)}/v2/{image_name}/tags/list'
+            params = {'n': n}
+            for _ in range(MAX_TAG_PAGES):
+                r = self.session.get(url=url, params=params, timeout=REQUEST_TIMEOUT)
+                tags.extend(r.json().get('tags') or [])
+                next_page = r.links.get('next')
+                if not next_page:
+                    return tags
+                # Ссылка обычно относительная и уже содержит n и last
+                url = urljoin(url, next_page['url'])
+                params = None
+            logger.info(f"Tag list for {image_name} truncated at {MAX_TAG_PAGES} pages")
+            return tags
         except Exception as e:
             logger.info(f"Failed to get versions for {image_name}: {str(e)}")
             return []
 
+    def invalidate_tags(self, images: Optional[Iterable[tuple[str, str]]] = None):
+        """Сбрасывает кеш тегов для (image_name, registry) или целиком"""
+        if images is None:
+            self._tags.clear()
+            self._metadata_latest.clear()
+            return
+        images = set(images)
+        for key in images:
+            self._tags.pop(key, None)
+        for key in [key for key in self._metadata_latest if key[:2] in images]:
+            del self._metadata_latest[key]
 
-    def get_latest_version(self, image_name: str, registry: str, current_tag: str | None) -> str | None:
+
+    def get_latest_version(
+        self,
+        image_name: str,
+        registry: str,
+        current_tag: str | None,
+        match_regex: str | None = None,
+        use_metadata: bool = False,
+        check: Optional[Callable[[], None]] = None,
+    ) -> str | None:
         if not current_tag:
             return None
         versions = self.get_available_versions(image_name, registry)
         prefix, _ = VersionNormalizer.normalize(current_tag)
         if not versions:
             return None
+        if isinstance(versions, PackedTagStore) and not match_regex and not use_metadata:
+            return versions.latest(prefix)
+        if match_regex:
+            # Явный фильтр заменяет сравнение префиксов
+            versions = self.tag_filter.filter(f"{registry}/{image_name}", match_regex, versions)
+            if not versions:
+                return None
+            if not use_metadata:
+                return max(versions, key=lambda v: version_key(VersionNormalizer.normalize(v)[1]))
+        if use_metadata:
+            return self._get_latest_by_metadata(image_name, registry, match_regex, versions, check)
 
         matching_versions = []
         for v in versions:
@@ -82,21 +129,43 @@ class RegistryClient:
         if not matching_versions:
             return None
 
-        def version_key(v: str) -> tuple[int, ...]:
-            try:
-                return tuple(map(int, v.split('.')[:3]))
-            except ValueError:
-                return (0,)
-
         matching_versions.sort(reverse=True, key=lambda x: version_key(x[0]))
         return matching_versions[0][1]
 
+    def _get_latest_by_metadata(
+        self,
+        image_name: str,
+        registry: str,
+        match_regex: str | None,
+        versions: Sequence[str],
+        check: Optional[Callable[[], None]] = None,
+    ) -> str | None:
+        # Теги без semver (latest, даты, git SHA) упорядочиваем по времени создания образа.
+        # Результат действителен, пока кеш тегов отдает тот же объект списка,
+        # поэтому контейнеры одного образа не повторяют запросы к registry
+        key = (image_name, registry, match_regex)
+        cached = self._metadata_latest.get(key)
+        if cached is not None and cached[0] is versions:
+            return cached[1]
+
+        created = self.metadata.get_created_times(image_name, registry, list(versions), check)
+        latest = max(
+            created,
+            key=lambda v: (created[v], version_key(VersionNormalizer.normalize(v)[1])),
+        ) if created else None
+        self._metadata_latest[key] = (versions, latest)
+        return latest
+
     def get_tag_by_digest(self, image: ImageReference) -> Optional[str]:
         pass
     
     
     def update_config(self, new_config: RegistryConfig):
         self.config = new_config
+        if self.metadata.max_workers != self.config.metadata_workers:
+            self.metadata.set_max_workers(self.config.metadata_workers)
+        self.invalidate_tags()
+        self.tag_filter.clear()
         if self.config.auth_type == "token":
             self.session.headers.update({
                 "Authorization": f"Bearer {self.config.token}"
@@ -0,0 +1,138 @@
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from dataclasses import dataclass, asdict
+from typing import Iterator, Optional
+
+
+INDEXED_FIELDS = ("namespace", "image", "registry", "status")
+
+
+@dataclass
+class CheckResult:
+    """Результат проверки одного контейнера"""
+    image: str
+    registry: str
+    namespace: str
+    pod: str
+    current: Optional[str]
+    desired: str
+    latest: Optional[str]
+    status: str
+    major_diff: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class _Snapshot:
+    generation: int
+    results: list[CheckResult]
+    # Порядковые номера записей, возрастают вместе с позицией
+    seqs: array
+    indexes: dict[str, dict[str, list[int]]]
+
+
+class ResultStore:
+    """
+    Хранит результаты последней проверки в памяти.
+    Индексы по namespace, image, registry и status строятся один раз при записи,
+    а снапшот заменяется целиком, поэтому чтения не блокируются.
+    Курсор указывает на порядковый номер записи: частичное обновление
+    сохраняет номера нетронутых записей и выдает обновленным новые, поэтому
+    пагинация переживает его. Поколение меняется только при полной замене.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = _Snapshot(generation=0, results=[], seqs=array('q'), indexes={})
+
+    @property
+    def generation(self) -> int:
+        return self._snapshot.generation
+
+    def replace(self, results: list[CheckResult]):
+        with self._lock:
+            self._snapshot = self._build(
+                self._snapshot.generation + 1,
+                list(results),
+                array('q', range(len(results))),
+            )
+
+    def update(self, results: list[CheckResult], images: set[str]):
+        """Заменяет результаты только для перечисленных образов (частичное обновление)"""
+        with self._lock:
+            snapshot = self._snapshot
+            kept = [
+                position for position, result in enumerate(snapshot.results)
+                if result.image not in images
+            ]
+            next_seq = snapshot.seqs[-1] + 1 if snapshot.seqs else 0
+            self._snapshot = self._build(
+                snapshot.generation,
+                [snapshot.results[position] for position in kept] + results,
+                array('q', [snapshot.seqs[position] for position in kept])
+                + array('q', range(next_seq, next_seq + len(results))),
+            )
+
+    @staticmethod
+    def _build(generation: int, results: list[CheckResult], seqs: array) -> _Snapshot:
+        indexes: dict[str, dict[str, list[int]]] = {field: {} for field in INDEXED_FIELDS}
+        for position, result in enumerate(results):
+            for field in INDEXED_FIELDS:
+                indexes[field].setdefault(getattr(result, field), []).append(position)
+        return _Snapshot(generation=generation, results=results, seqs=seqs, indexes=indexes)
+
+    def iter(self, cursor: Optional[str] = None, **filters: Optional[str]) -> Iterator[tuple[str, CheckResult]]:
+        """Возвращает пары (курсор, результат) для записей, подходящих под фильтры"""
+        snapshot = self._snapshot
+        # Курсор проверяется сразу, до начала итерации
+        after = self._parse_cursor(snapshot, cursor)
+        filters = {field: value for field, value in filters.items() if value is not None}
+        return self._iter_snapshot(snapshot, after, filters)
+
+    @staticmethod
+    def _iter_snapshot(snapshot: _Snapshot, after: int, filters: dict[str, str]) -> Iterator[tuple[str, CheckResult]]:
+        if filters:
+            # Начинаем с самого короткого индекса, остальные поля проверяем напрямую
+            candidates = min(
+                (snapshot.indexes[field].get(value, []) for field, value in filters.items()),
+                key=len,
+            )
+        else:
+            candidates = range(len(snapshot.results))
+
+        start = bisect_left(candidates, bisect_right(snapshot.seqs, after))
+        for position in islice(candidates, start, None):
+            result = snapshot.results[position]
+            if all(getattr(result, field) == value for field, value in filters.items()):
+                yield f"{snapshot.generation}:{snapshot.seqs[position]}", result
+
+    def query(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        **filters: Optional[str],
+    ) -> tuple[list[CheckResult], Optional[str]]:
+        """Возвращает страницу результатов и курсор следующей страницы"""
+        page = []
+        last_cursor = None
+        for item_cursor, result in self.iter(cursor, **filters):
+            if len(page) == limit:
+                return page, last_cursor
+            page.append(result)
+            last_cursor = item_cursor
+        return page, None
+
+    @staticmethod
+    def _parse_cursor(snapshot: _Snapshot, cursor: Optional[str]) -> int:
+        if not cursor:
+            return -1
+        try:
+            generation, seq = map(int, cursor.split(':'))
+        except ValueError:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        if generation != snapshot.generation:
+            raise LookupError("Cursor refers to an outdated result set")
+        return seq
@@ -0,0 +1,156 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+from config import logger
+
+
+FULL = "full"
+REFRESH = "refresh"
+
+
+class RunCancelled(Exception):
+    pass
+
+
+@dataclass
+class Run:
+    """Состояние одной проверки версий"""
+    id: str
+    kind: str
+    deadline: Optional[float] = None
+    status: str = "running"  # queued, running, completed, failed, cancelled, timeout
+    total: int = 0
+    done: int = 0
+    error: Optional[str] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Прерывает проверку, если ее отменили или истек срок"""
+        if self._cancel.is_set():
+            raise RunCancelled("cancelled")
+        if self.deadline is not None and time.time() > self.deadline:
+            raise RunCancelled("timeout")
+
+    def advance(self, count: int = 1):
+        self.done += count
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RunCoordinator:
+    """
+    Запускает проверки по принципу single-flight: пока идет проверка, новые
+    запросы присоединяются к ней, а не запускают параллельный обход registry.
+    Полная проверка покрывает частичную; полная, запрошенная во время
+    частичной, ставится в очередь и стартует следом.
+    """
+    def __init__(self, timeout: Optional[int] = None, history: int = 20):
+        self.timeout = timeout
+        self.history = history
+        self._lock = threading.Lock()
+        self._active: Optional[Run] = None
+        self._queued: Optional[tuple[Run, Callable[[Run], None]]] = None
+        self._runs: OrderedDict[str, Run] = OrderedDict()
+
+    @property
+    def active(self) -> Optional[Run]:
+        return self._active
+
+    def start(self, target: Callable[[Run], None], kind: str = FULL) -> Run:
+        with self._lock:
+            active = self._active
+            # К отмененной проверке не присоединяемся: она завершится со статусом cancelled
+            if active is not None and not active.cancelled and (active.kind == kind or active.kind == FULL):
+                return active
+            if self._queued is not None:
+                queued = self._queued[0]
+                if not queued.cancelled:
+                    return queued
+                self._queued = None
+                self._finish(queued, "cancelled")
+            run = Run(id=uuid.uuid4().hex, kind=kind)
+            if kind == FULL:
+                # В историю попадают только полные проверки: их запускают клиенты
+                # и опрашивают по id, а частичные стартуют планировщиком каждую минуту
+                self._runs[run.id] = run
+                while len(self._runs) > self.history:
+                    self._runs.popitem(last=False)
+            if active is not None:
+                # Новая проверка во время частичной или отмененной стартует сразу после нее
+                run.status = "queued"
+                self._queued = (run, target)
+                return run
+            self._active = run
+        self._launch(run, target)
+        return run
+
+    @staticmethod
+    def _finish(run: Run, status: str):
+        run.status = status
+        run.finished_at = time.time()
+        run._finished.set()
+
+    def _launch(self, run: Run, target: Callable[[Run], None]):
+        run.status = "running"
+        run.started_at = time.time()
+        run.deadline = run.started_at + self.timeout if self.timeout else None
+        threading.Thread(target=self._execute, args=(run, target), daemon=True).start()
+
+    def get(self, run_id: str) -> Optional[Run]:
+        return self._runs.get(run_id)
+
+    def cancel(self, run_id: str) -> Optional[Run]:
+        run = self._runs.get(run_id)
+        if run is not None and not run.finished:
+            # Отмененная в очереди проверка завершится на первой же проверке run.check()
+            run.cancel()
+        return run
+
+    def _execute(self, run: Run, target: Callable[[Run], None]):
+        try:
+            target(run)
+            run.status = "completed"
+        except RunCancelled as e:
+            run.status = str(e)
+            logger.info(f"Run {run.id} stopped: {e}")
+        except Exception as e:
+            run.status = "failed"
+            run.error = str(e)
+            logger.info(f"Run {run.id} failed: {e}")
+        finally:
+            with self._lock:
+                queued, self._queued = self._queued, None
+                self._active = queued[0] if queued else None
+            self._finish(run, run.status)
+            if queued:
+                self._launch(*queued)
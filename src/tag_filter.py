@@ -0,0 +1,40 @@
+import re
+from functools import lru_cache
+from typing import Sequence
+from config import logger
+
+
+@lru_cache(maxsize=256)
+def compile_regex(pattern: str) -> re.Pattern:
+    """Компилирует регулярное выражение один раз для всего процесса"""
+    return re.compile(pattern)
+
+
+class TagFilter:
+    """
+    Фильтрует списки тегов по регулярному выражению.
+    Результат запоминается по (образ, regex); закешированное значение
+    действительно, пока registry-клиент возвращает тот же объект списка тегов,
+    поэтому сотни подов с одним фильтром не сканируют список повторно.
+    """
+    def __init__(self):
+        self._cache: dict[tuple[str, str], tuple[Sequence[str], list[str]]] = {}
+
+    def filter(self, image_key: str, pattern: str, tags: Sequence[str]) -> list[str]:
+        cached = self._cache.get((image_key, pattern))
+        if cached is not None and cached[0] is tags:
+            return cached[1]
+
+        try:
+            search = compile_regex(pattern).search
+        except re.error as e:
+            logger.info(f"Invalid match regex {pattern!r} for {image_key}: {e}")
+            return []
+
+        matched = [tag for tag in tags if search(tag)]
+        self._cache[(image_key, pattern)] = (tags, matched)
+        return matched
+
+    def clear(self):
+        self._cache.clear()
+
@@ -0,0 +1,74 @@
+from array import array
+from collections.abc import Sequence
+from typing import Optional
+from version import VersionNormalizer, version_key
+
+
+COMPONENTS = 3
+# Компоненты хранятся в int32, если все влезают, иначе в int64.
+# Недостающие заполняются минимальным значением: (1, 2) < (1, 2, 0), как у кортежей
+INT32_MIN, INT32_MAX = -(2 ** 31), 2 ** 31 - 1
+INT64_MIN, INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+
+
+class PackedTagStore(Sequence):
+    """
+    Компактное хранилище списка тегов одного образа.
+    Теги лежат в одной строке-таблице со смещениями, разобранные числовые
+    компоненты и идентификаторы семейства формата (префикса) - в плотных
+    массивах, поэтому поиск последней версии не разбирает строки заново.
+    """
+    __slots__ = ('_table', '_offsets', '_components', '_families', '_family_ids')
+
+    def __init__(self, tags: list[str]):
+        self._table = "".join(tags)
+        self._offsets = array('I', [0])
+        self._families = array('I')
+        self._family_ids: dict[str, int] = {}
+
+        keys = []
+        position = 0
+        for tag in tags:
+            position += len(tag)
+            self._offsets.append(position)
+            prefix, number = VersionNormalizer.normalize(tag)
+            self._families.append(self._family_ids.setdefault(prefix, len(self._family_ids)))
+            keys.append(version_key(number))
+
+        fits_int32 = all(INT32_MIN < n <= INT32_MAX for key in keys for n in key)
+        pad = INT32_MIN if fits_int32 else INT64_MIN
+        self._components = array('i' if fits_int32 else 'q')
+        for key in keys:
+            self._components.extend(max(min(n, INT64_MAX), INT64_MIN + 1) for n in key)
+            self._components.extend([pad] * (COMPONENTS - len(key)))
+
+    def __len__(self) -> int:
+        return len(self._families)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._table[self._offsets[index]:self._offsets[index + 1]]
+
+    def latest(self, prefix: str) -> Optional[str]:
+        """Последняя версия среди тегов с тем же префиксом, что и у текущего"""
+        family = self._family_ids.get(prefix)
+        if family is None:
+            return None
+        components = self._components
+        best = -1
+        best_key = None
+        for index, tag_family in enumerate(self._families):
+            if tag_family != family:
+                continue
+            start = index * COMPONENTS
+            key = components[start:start + COMPONENTS]
+            # При равенстве остается первый тег, как при стабильной сортировке
+            if best_key is None or key > best_key:
+                best, best_key = index, key
+        return self[best] if best >= 0 else None
+
@@ -64,6 +64,34 @@ class Version:
             return -1 if self.patch < other.patch else 1
         return 0
 
+
+class VersionNormalizer:
+    @staticmethod
+    def normalize(version: str) -> tuple[str, str]:
+        """
+        Нормализует версию и возвращает (префикс, чистая версия)
+        Примеры:
+            "v1.2.3" -> ("v", "1.2.3")
+            "2.5.0" -> ("", "2.5.0")
+            "release-3.1" -> ("release-", "3.1")
+        """
+        match = re.match(r'^([^\d]*)([\d.]+.*)$', version)
+        if match:
+            return (match.group(1), match.group(2))
+        return ("", version)
+
+    @staticmethod
+    def denormalize(prefix: str, version: str) -> str:
+        return f"{prefix}{version}"
+
+
+def version_key(v: str) -> tuple[int, ...]:
+    try:
+        return tuple(map(int, v.split('.')[:3]))
+    except ValueError:
+        return (0,)
+
+
 def version_difference(
     current_version: str,
     desired_version: str,
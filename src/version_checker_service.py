@@ -1,7 +1,13 @@
-from config import load_config
+import threading
+from config import AppConfig, DEFAULT_RUN_TIMEOUT, RefreshConfig, load_config
 from kubernetes_client import KubernetesClient
 from metrics import MetricsCollector
+from models.image import ImageReference
+from refresh_scheduler import RefreshScheduler
+from reference import canonical_name
 from registry_client import RegistryClient
+from results import CheckResult, ResultStore
+from runs import FULL, REFRESH, Run, RunCoordinator
 from typing import Optional 
 from functools import lru_cache
 from config import logger
@@ -9,16 +15,119 @@ from config import logger
 
 class VersionCheckerService:
     def __init__(self):
-        self.config = load_config()
-        self.k8s_client = KubernetesClient()
-        self.registry_client = RegistryClient(self.config.registry)
+        # Конфигурация тоже читается при первом обращении: ошибка в ней
+        # не должна мешать серверу подняться и отвечать на /health
+        self._config: Optional[AppConfig] = None
+        self._config_lock = threading.Lock()
         self.metrics = MetricsCollector()
+        self.results = ResultStore()
+        self.refresh_scheduler = RefreshScheduler(RefreshConfig(), [])
+        self.runs = RunCoordinator(timeout=DEFAULT_RUN_TIMEOUT)
+        # Клиенты создаются при первом обращении, чтобы не блокировать старт сервера
+        self._k8s_client: Optional[KubernetesClient] = None
+        self._registry_client: Optional[RegistryClient] = None
+        self._clients_lock = threading.Lock()
+        self.images: list[ImageReference] = []
+        self.ready = False
 
 
-    def check_versions(self):
+    @property
+    def config(self) -> AppConfig:
+        if self._config is None:
+            with self._config_lock:
+                if self._config is None:
+                    self._apply_config(load_config())
+        return self._config
+
+
+    def _apply_config(self, config: AppConfig):
+        self.get_desired_version.cache_clear()
+        self.get_match_regex.cache_clear()
+        self.get_use_metadata.cache_clear()
+        self.resolve_sha_by_config.cache_clear()
+        if self._registry_client is not None:
+            self._registry_client.update_config(config.registry)
+        self.refresh_scheduler.update_config(config.refresh, config.images)
+        self.runs.timeout = config.run_timeout
+        self._config = config
+
+
+    @property
+    def k8s_client(self) -> KubernetesClient:
+        if self._k8s_client is None:
+            with self._clients_lock:
+                if self._k8s_client is None:
+                    self._k8s_client = KubernetesClient()
+        return self._k8s_client
+
+
+    @property
+    def registry_client(self) -> RegistryClient:
+        if self._registry_client is None:
+            with self._clients_lock:
+                if self._registry_client is None:
+                    self._registry_client = RegistryClient(self.config.registry)
+        return self._registry_client
+
+
+    def load_inventory(self) -> list[ImageReference]:
+        self.images = self.k8s_client.get_pod_images(self.config.namespace_list)
+        self.ready = True
+        return self.images
+
+
+    def start_check(self) -> Run:
+        """Запускает полную проверку или возвращает уже идущую"""
+        return self.runs.start(self.check_versions, FULL)
+
+
+    def start_refresh(self) -> Optional[Run]:
+        # Тик планировщика раз в минуту: без инвентаря или без образов к обновлению проверку не создаем
+        if not self.ready or not self.refresh_scheduler.due(self.images):
+            return None
+        return self.runs.start(self.refresh_due, REFRESH)
+
+
+    def check_versions(self, run: Optional[Run] = None):
+        if run:
+            # Отмененная в очереди или просроченная проверка не трогает API и кеш тегов
+            run.check()
         logger.info("Starting version check...")
-        images = self.k8s_client.get_pod_images(self.config.namespace_list)
+        images = self.load_inventory()
+        # Теги образов с уровнем обновления обновляет RefreshScheduler со своим разбросом;
+        # полная проверка перечитывает инвентарь и заново запрашивает только остальные образы
+        self.registry_client.invalidate_tags({
+            (image.name, image.registry)
+            for image in images
+            if self.refresh_scheduler.interval(image) is None
+        })
+        self.results.replace(self._check_images(images, run))
+        logger.info("Version check completed")
+
+
+    def refresh_due(self, run: Optional[Run] = None):
+        """Проверяет только образы, у которых наступил срок по их уровню обновления"""
+        if run:
+            run.check()
+        if not self.ready:
+            return
+        images = self.refresh_scheduler.due(self.images)
+        if not images:
+            return
+        logger.info(f"Refreshing {len(images)} containers by tier schedule")
+        self.registry_client.invalidate_tags({(image.name, image.registry) for image in images})
+        self.results.update(self._check_images(images, run), {image.full_name for image in images})
+        self.refresh_scheduler.mark_checked(images)
+
+
+    def _check_images(self, images: list[ImageReference], run: Optional[Run] = None) -> list[CheckResult]:
+        results = []
+        if run:
+            run.total = len(images)
         for image in images:
+            if run:
+                run.check()
+                run.advance()
             logger.info(f'Working with {image.name} pod: {image.pod_name} in namespace: {image.namespace}')
             if not image.tag and image.digest:
                 image.tag = self.resolve_sha_by_config(image.full_name, image.digest)
@@ -29,24 +138,59 @@ class VersionCheckerService:
                 image,
                 desired_version
             )
-            latest_version = self.registry_client.get_latest_version(image.name, image.registry, image.tag)
+            latest_version = self.registry_client.get_latest_version(
+                image.name,
+                image.registry,
+                image.tag,
+                image.match_regex or self.get_match_regex(image.full_name),
+                image.use_metadata or self.get_use_metadata(image.full_name),
+                # Отмена и дедлайн действуют и внутри долгих запросов метаданных
+                run.check if run else None,
+            )
             self.metrics.update(image, desired_version, latest_version, status)
-        logger.info("Version check completed")
+            results.append(CheckResult(
+                image=image.full_name,
+                registry=image.registry,
+                namespace=image.namespace,
+                pod=image.pod_name,
+                current=status["current"],
+                desired=desired_version,
+                latest=latest_version,
+                status=status["status"],
+                major_diff=status["major_diff"],
+            ))
+        return results
 
 
     @lru_cache(maxsize=100)
     def get_desired_version(self, image_name: str) -> Optional[str]:
         for img in self.config.images:
-            if img.name == image_name:
+            if canonical_name(img.name) == image_name:
                 return img.desired_tag
         return None
 
 
+    @lru_cache(maxsize=100)
+    def get_match_regex(self, image_name: str) -> Optional[str]:
+        for img in self.config.images:
+            if canonical_name(img.name) == image_name:
+                return img.match_regex
+        return None
+
+
+    @lru_cache(maxsize=100)
+    def get_use_metadata(self, image_name: str) -> bool:
+        for img in self.config.images:
+            if canonical_name(img.name) == image_name:
+                return img.use_metadata
+        return False
+
+
     @lru_cache(maxsize=100)
     def resolve_sha_by_config(self, image_name: str, sha256: str) -> Optional[str]:
         for img in self.config.images:
-            if img.name == image_name:
-                for sha256_catalog in img.resolve_sha256:
+            if canonical_name(img.name) == image_name:
+                for sha256_catalog in img.resolve_sha256 or []:
                     if sha256_catalog.hash == sha256:
                         return sha256_catalog.tag
         return None
@@ -54,8 +198,9 @@ class VersionCheckerService:
 
     def reload_config(self):
         try:
-            self.config = load_config()
-            self.registry_client.update_config(self.config.registry)
+            config = load_config()
+            with self._config_lock:
+                self._apply_config(config)
             return True
         except Exception as e:
             logger.info(f"Config reload failed: {e}")